@@ -6,23 +6,35 @@ Consolidado para hospedagem que requer um único arquivo.
 
 import sys
 import logging
+import logging.handlers
 import os
+import queue
 import asyncio
 import threading
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+import hashlib
+import heapq
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
-from urllib.parse import urlparse
-from urllib import request, error
+from types import MappingProxyType
+from weakref import WeakValueDictionary
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+import aiohttp
 import discord
 from discord.ext import commands, tasks
-from discord import app_commands
 from dotenv import load_dotenv
 from prisma import Prisma
-import io
-import random
+
+try:
+    import uvloop  # Opcional: loop mais rápido (não existe no Windows)
+except ImportError:
+    uvloop = None
 
 
 
@@ -52,7 +64,9 @@ DATABASE_CONFIG = {
 BOT_CONFIG = {
     'command_prefix': '/',
     'support_role_name': 'Suporte TI',
+    'support_role_id': 1382008028517109832,
     'tickets_category_name': 'Tecnologia',
+    'tickets_category_id': None,  # Preencha com o ID da categoria para evitar a busca por nome
     'auto_close_hours': 12,
     'auto_close_check_minutes': 30,
     'channel_names_to_setup': ['suporte', 'tickets', 'ajuda', 'support', 'help']
@@ -128,6 +142,10 @@ def validate_config():
 # CONFIGURAÇÃO DE LOGGING
 # ==================================================================================================
 LOG_FORMAT = "%(levelname)s: %(message)s"
+
+# Até main() o log vai direto para o StreamHandler; main() troca por um QueueHandler
+# (no event loop o log vira só um put na fila, a escrita roda na thread do QueueListener)
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 logging.getLogger('discord').setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
@@ -138,8 +156,37 @@ logger = logging.getLogger(__name__)
 # ==================================================================================================
 
 class DatabaseManager:
+    # Cache do último ticket e do ticket aberto por usuário (consultados a cada clique/submit)
+    LATEST_TICKET_TTL = 60
+    LATEST_TICKET_CACHE_SIZE = 1024
+
     def __init__(self, prisma: Prisma):
         self.prisma = prisma
+        self._latest_ticket_cache: "OrderedDict[int, tuple]" = OrderedDict()
+        self._open_ticket_cache: "OrderedDict[int, tuple]" = OrderedDict()
+        # Geração por usuário: uma consulta iniciada antes de uma invalidação não grava no cache
+        self._latest_ticket_generation: "OrderedDict[int, int]" = OrderedDict()
+        self._generation_counter = 0
+
+    def _invalidate_user_ticket_cache(self, user_id: int):
+        user_id = int(user_id)
+        self._latest_ticket_cache.pop(user_id, None)
+        self._open_ticket_cache.pop(user_id, None)
+        # Contador global (não por usuário) para que a poda abaixo nunca repita um valor já lido
+        self._generation_counter += 1
+        self._latest_ticket_generation[user_id] = self._generation_counter
+        self._latest_ticket_generation.move_to_end(user_id)
+        if len(self._latest_ticket_generation) > self.LATEST_TICKET_CACHE_SIZE:
+            self._latest_ticket_generation.popitem(last=False)
+
+    def _store_user_ticket_cache(self, cache: "OrderedDict[int, tuple]", user_id: int, generation: int, result):
+        # Consulta que começou antes de uma invalidação traria dado velho: não grava
+        if self._latest_ticket_generation.get(user_id, 0) != generation:
+            return
+        cache[user_id] = (time.monotonic(), result)
+        cache.move_to_end(user_id)
+        if len(cache) > self.LATEST_TICKET_CACHE_SIZE:
+            cache.popitem(last=False)
 
     async def init_database(self):
         # Prisma handles schema via 'prisma db push' or migrations.
@@ -163,10 +210,11 @@ class DatabaseManager:
                     'status': 'open'
                 }
             )
-            logger.info(f"Ticket criado: {ticket.id} para {user_name}")
+            self._invalidate_user_ticket_cache(user_id)
+            logger.info("Ticket criado: %s para %s", ticket.id, user_name)
             return ticket.id
         except Exception as e:
-            logger.error(f"Erro ao criar ticket: {e}")
+            logger.error("Erro ao criar ticket: %s", e)
             return None
 
     async def create_ticket(self, user_id: int, user_name: str, channel_id: int, reason: str, description: str) -> Optional[int]:
@@ -178,7 +226,7 @@ class DatabaseManager:
             ticket = await self.prisma.tickets.find_unique(where={'id': ticket_id})
             return ticket.model_dump() if ticket else None
         except Exception as e:
-            logger.error(f"Erro ao buscar ticket {ticket_id}: {e}")
+            logger.error("Erro ao buscar ticket %s: %s", ticket_id, e)
             return None
 
     async def get_ticket_by_channel(self, channel_id: int) -> Optional[Dict[str, Any]]:
@@ -189,7 +237,7 @@ class DatabaseManager:
             )
             return ticket.model_dump() if ticket else None
         except Exception as e:
-            logger.error(f"Erro ao buscar ticket do canal {channel_id}: {e}")
+            logger.error("Erro ao buscar ticket do canal %s: %s", channel_id, e)
             return None
     
     async def get_user_tickets(self, user_id: int, limit: int = 5) -> List[Dict[str, Any]]:
@@ -201,20 +249,44 @@ class DatabaseManager:
              )
              return [t.model_dump() for t in tickets]
         except Exception as e:
-            logger.error(f"Erro ao buscar tickets do usuário {user_id}: {e}")
+            logger.error("Erro ao buscar tickets do usuário %s: %s", user_id, e)
             return []
 
     async def get_user_latest_ticket(self, user_id: int) -> Optional[Dict[str, Any]]:
+        cached = self._latest_ticket_cache.get(user_id)
+        if cached and time.monotonic() - cached[0] < self.LATEST_TICKET_TTL:
+            return cached[1]
+        generation = self._latest_ticket_generation.get(user_id, 0)
         try:
             ticket = await self.prisma.tickets.find_first(
                 where={'user_id': user_id},
                 order={'id': 'desc'}
             )
-            return ticket.model_dump() if ticket else None
+            result = ticket.model_dump() if ticket else None
+            self._store_user_ticket_cache(self._latest_ticket_cache, user_id, generation, result)
+            return result
         except Exception as e:
-             logger.error(f"Erro ao buscar ultimo ticket do usuario {user_id}: {e}")
+             logger.error("Erro ao buscar ultimo ticket do usuario %s: %s", user_id, e)
              return None
 
+    async def get_user_open_ticket(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Ticket aberto mais recente do usuário, mesmo que não seja o último criado."""
+        cached = self._open_ticket_cache.get(user_id)
+        if cached and time.monotonic() - cached[0] < self.LATEST_TICKET_TTL:
+            return cached[1]
+        generation = self._latest_ticket_generation.get(user_id, 0)
+        try:
+            ticket = await self.prisma.tickets.find_first(
+                where={'user_id': user_id, 'status': 'open'},
+                order={'created_at': 'desc'}
+            )
+            result = ticket.model_dump() if ticket else None
+            self._store_user_ticket_cache(self._open_ticket_cache, user_id, generation, result)
+            return result
+        except Exception as e:
+            logger.error("Erro ao buscar ticket aberto do usuario %s: %s", user_id, e)
+            return None
+
     async def close_ticket(self, channel_id: int) -> bool:
          # Custom method to match the logic of just changing status?
          try:
@@ -226,10 +298,11 @@ class DatabaseManager:
                  where={'id': ticket['id']},
                  data={'status': 'closed', 'closed_at': datetime.now()}
              )
-             logger.info(f"Ticket do canal {channel_id} fechado.")
+             self._invalidate_user_ticket_cache(ticket['user_id'])
+             logger.info("Ticket do canal %s fechado.", channel_id)
              return True
          except Exception as e:
-             logger.error(f"Erro ao fechar ticket (status) channel {channel_id}: {e}")
+             logger.error("Erro ao fechar ticket (status) channel %s: %s", channel_id, e)
              return False
 
     async def reopen_ticket(self, channel_id: int, reason: str, description: str) -> Optional[int]:
@@ -247,13 +320,14 @@ class DatabaseManager:
                      'closed_at': None,
                      'paused_at': None,
                      'paused_by': None,
-                     'created_at': datetime.now() # Reset created_at? Original did this.
+                     'created_at': datetime.now(timezone.utc) # Reset created_at? Original did this.
                  }
              )
-             logger.info(f"Ticket {ticket['id']} reaberto.")
+             self._invalidate_user_ticket_cache(ticket['user_id'])
+             logger.info("Ticket %s reaberto.", ticket['id'])
              return updated.id
         except Exception as e:
-            logger.error(f"Erro ao reabrir ticket do canal {channel_id}: {e}")
+            logger.error("Erro ao reabrir ticket do canal %s: %s", channel_id, e)
             return None
 
     async def pause_ticket(self, channel_id: int, paused_by: str) -> bool:
@@ -269,9 +343,10 @@ class DatabaseManager:
                      'paused_by': paused_by
                  }
              )
+             self._invalidate_user_ticket_cache(ticket['user_id'])
              return True
         except Exception as e:
-            logger.error(f"Erro ao pausar ticket do canal {channel_id}: {e}")
+            logger.error("Erro ao pausar ticket do canal %s: %s", channel_id, e)
             return False
 
     async def unpause_ticket(self, channel_id: int) -> bool:
@@ -287,9 +362,10 @@ class DatabaseManager:
                      'paused_by': None
                  }
              )
+             self._invalidate_user_ticket_cache(ticket['user_id'])
              return True
         except Exception as e:
-             logger.error(f"Erro ao despausar ticket do canal {channel_id}: {e}")
+             logger.error("Erro ao despausar ticket do canal %s: %s", channel_id, e)
              return False
 
     async def get_open_tickets(self) -> List[Dict[str, Any]]:
@@ -300,9 +376,49 @@ class DatabaseManager:
             )
             return [t.model_dump() for t in tickets]
         except Exception as e:
-            logger.error(f"Erro ao buscar tickets abertos: {e}")
+            logger.error("Erro ao buscar tickets abertos: %s", e)
             return []
 
+    async def get_expired_tickets(self, hours: int, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        # Filtro de idade feito no banco (índice em status + created_at), só volta o que vai fechar
+        # now em UTC: o prisma trata datetime sem fuso como UTC, o que desloca o corte fora de UTC
+        now = now or datetime.now(timezone.utc)
+        try:
+            tickets = await self.prisma.tickets.find_many(
+                where={
+                    'status': 'open',
+                    'created_at': {'lte': now - timedelta(hours=hours)}
+                },
+                order={'created_at': 'asc'}
+            )
+            return [t.model_dump() for t in tickets]
+        except Exception as e:
+            logger.error("Erro ao buscar tickets expirados: %s", e)
+            return []
+
+    async def get_next_expiry(self, hours: int, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Momento em que o próximo ticket aberto (ainda não vencido) atinge o fechamento automático."""
+        # Vencidos que não puderam ser fechados (canal sumiu) ficam de fora para não girar em loop;
+        # usar o mesmo now de get_expired_tickets mantém gt/lte complementares
+        now = now or datetime.now(timezone.utc)
+        try:
+            ticket = await self.prisma.tickets.find_first(
+                where={
+                    'status': 'open',
+                    'created_at': {'gt': now - timedelta(hours=hours)}
+                },
+                order={'created_at': 'asc'}
+            )
+            if not ticket or not ticket.created_at:
+                return None
+            created_at = ticket.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            return created_at + timedelta(hours=hours)
+        except Exception as e:
+            logger.error("Erro ao buscar próximo vencimento: %s", e)
+            return None
+
     async def get_ticket_stats(self) -> Dict[str, int]:
         try:
             total = await self.prisma.tickets.count()
@@ -311,7 +427,7 @@ class DatabaseManager:
             paused_count = await self.prisma.tickets.count(where={'status': 'paused'})
             return {"total": total, "open": open_count, "closed": closed_count, "paused": paused_count}
         except Exception as e:
-            logger.error(f"Erro ao buscar stats: {e}")
+            logger.error("Erro ao buscar stats: %s", e)
             return {"total": 0, "open": 0, "closed": 0, "paused": 0}
 
     async def add_birthday(self, user_id: int, day: int, month: int) -> bool:
@@ -325,7 +441,7 @@ class DatabaseManager:
             )
             return True
         except Exception as e:
-            logger.error(f"Erro ao adicionar aniversario: {e}")
+            logger.error("Erro ao adicionar aniversario: %s", e)
             return False
 
     async def remove_birthday(self, user_id: int) -> bool:
@@ -342,7 +458,7 @@ class DatabaseManager:
             )
             return [int(b.user_id) for b in birthdays]
         except Exception as e:
-            logger.error(f"Erro ao buscar aniversariantes: {e}")
+            logger.error("Erro ao buscar aniversariantes: %s", e)
             return []
     
     async def get_all_birthdays(self) -> List[Dict[str, Any]]:
@@ -350,7 +466,7 @@ class DatabaseManager:
             birthdays = await self.prisma.birthday.find_many()
             return [{'user_id': int(b.user_id), 'day': b.day, 'month': b.month} for b in birthdays]
         except Exception as e:
-             logger.error(f"Erro ao listar todos aniversarios: {e}")
+             logger.error("Erro ao listar todos aniversarios: %s", e)
              return []
 
     async def get_birthday(self, user_id: int) -> Optional[Dict[str, Any]]:
@@ -360,7 +476,7 @@ class DatabaseManager:
                 return {'user_id': int(birthday.user_id), 'day': birthday.day, 'month': birthday.month}
             return None
         except Exception as e:
-            logger.error(f"Erro ao buscar aniversario do usuario {user_id}: {e}")
+            logger.error("Erro ao buscar aniversario do usuario %s: %s", user_id, e)
             return None
 
 
@@ -368,8 +484,20 @@ class DatabaseManager:
 # UTILS (utils/helpers.py)
 # ==================================================================================================
 
+# Emojis já resolvidos por (guild_id, emoji_str); limpo quando os emojis de alguma guild mudam
+_EMOJI_CACHE: Dict[tuple, Any] = {}
+
+
 def resolve_emoji(bot: discord.Client, emoji_str: str, guild: discord.Guild = None):
     """Resolve um emoji string para um objeto emoji do Discord."""
+    key = (guild.id if guild else 0, emoji_str)
+    emoji = _EMOJI_CACHE.get(key)
+    if emoji is None:
+        emoji = _EMOJI_CACHE[key] = _resolve_emoji_uncached(bot, emoji_str, guild)
+    return emoji
+
+
+def _resolve_emoji_uncached(bot: discord.Client, emoji_str: str, guild: Optional[discord.Guild]):
     try:
         if emoji_str.startswith('<'):
             return discord.PartialEmoji.from_str(emoji_str)
@@ -388,15 +516,121 @@ def resolve_emoji(bot: discord.Client, emoji_str: str, guild: discord.Guild = No
     return emoji_str
 
 
-def schedule_ephemeral_deletion(
-    interaction: discord.Interaction,
-    message: Optional[discord.Message] = None,
-    delay: int = 120,
-):
-    """Remove mensagens ephemerals após o tempo indicado."""
-    async def delete_ephemeral_message():
+# Referências fortes das tasks em background (o loop só guarda referência fraca)
+_BG_TASKS: "set[asyncio.Task]" = set()
+
+
+def _log_task_exception(task: asyncio.Task):
+    _BG_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Erro em task de background: %s", task.exception(), exc_info=task.exception())
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Cria uma task mantendo referência até o fim e logando exceções não tratadas."""
+    task = asyncio.create_task(coro)
+    _BG_TASKS.add(task)
+    task.add_done_callback(_log_task_exception)
+    return task
+
+
+class _TokenBucket:
+    """Token bucket simples: libera até `capacity` chamadas em rajada e repõe `rate` por segundo."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1.0
+                self.last = time.monotonic()
+            self.tokens -= 1
+
+
+# Edições de overwrite por guild (~5 a cada 5s): espera aqui em vez de tomar 429 do Discord
+PERMISSION_EDIT_RATE = 1.0
+PERMISSION_EDIT_BURST = 5
+_PERMISSION_BUCKETS: Dict[int, _TokenBucket] = {}
+
+
+async def set_permissions_throttled(channel: discord.abc.GuildChannel, target, **permissions):
+    # set_permissions substitui o overwrite inteiro; se já está igual, nem gasta a chamada
+    if channel.overwrites_for(target) == discord.PermissionOverwrite(**permissions):
+        return
+    await _permission_bucket(channel.guild.id).acquire()
+    await channel.set_permissions(target, **permissions)
+
+
+async def replace_overwrites_throttled(channel: discord.abc.GuildChannel, changes: Dict[Any, discord.PermissionOverwrite]):
+    """Aplica vários overwrites num único channel.edit em vez de um set_permissions por alvo."""
+    if all(channel.overwrites_for(target) == overwrite for target, overwrite in changes.items()):
+        return
+    # Compara por ID: o mesmo alvo pode aparecer como Member ou como discord.Object
+    changed_ids = {target.id for target in changes}
+    overwrites = {target: ow for target, ow in channel.overwrites.items() if target.id not in changed_ids}
+    overwrites.update(changes)
+    await _permission_bucket(channel.guild.id).acquire()
+    await channel.edit(overwrites=overwrites)
+
+
+def _permission_bucket(guild_id: int) -> _TokenBucket:
+    bucket = _PERMISSION_BUCKETS.get(guild_id)
+    if bucket is None:
+        bucket = _PERMISSION_BUCKETS[guild_id] = _TokenBucket(PERMISSION_EDIT_RATE, PERMISSION_EDIT_BURST)
+    return bucket
+
+
+class _EphemeralDeletionQueue:
+    """Fila única (heap por prazo) que remove mensagens ephemerals com um só worker."""
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def push(self, interaction: discord.Interaction, message: Optional[discord.Message], delay: int):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + delay
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (deadline, next(self._counter), interaction, message))
+
+        if self._worker is None or self._worker.done():
+            self._worker = _spawn(self._run())
+        elif earliest is None or deadline < earliest:
+            self._wakeup.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._heap:
+            timeout = self._heap[0][0] - loop.time()
+            if timeout > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = loop.time()
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                _, _, interaction, message = heapq.heappop(self._heap)
+                due.append(self._delete(interaction, message))
+            await asyncio.gather(*due)
+
+    @staticmethod
+    async def _delete(interaction: discord.Interaction, message: Optional[discord.Message]):
         try:
-            await asyncio.sleep(delay)
             if message is not None:
                 await message.delete()
             else:
@@ -406,66 +640,79 @@ def schedule_ephemeral_deletion(
         except Exception as exc:
             logger.debug("Falha ao remover mensagem ephemeral: %s", exc)
 
-    asyncio.create_task(delete_ephemeral_message())
+
+_ephemeral_deletions = _EphemeralDeletionQueue()
+
+
+def schedule_ephemeral_deletion(
+    interaction: discord.Interaction,
+    message: Optional[discord.Message] = None,
+    delay: int = 120,
+):
+    """Remove mensagens ephemerals após o tempo indicado."""
+    _ephemeral_deletions.push(interaction, message, delay)
+
+
+# Embeds de fechamento montados uma vez; cada fechamento copia e só ajusta o horário
+_CLOSE_EMBED_TEMPLATE = discord.Embed(
+    title="🔒 TICKET FECHADO",
+    description="Este ticket foi fechado e está agora em modo somente leitura.\n\n"
+               "**Histórico Preservado:** Todo o histórico foi mantido.\n"
+               "**Reabertura:** Use o botão abaixo para reabrir este ticket.",
+    color=EMBED_COLORS['closed'],
+)
+_AUTO_CLOSE_EMBED_TEMPLATE = _CLOSE_EMBED_TEMPLATE.copy().add_field(
+    name="⏰ Motivo",
+    value=f"Fechamento automático após {BOT_CONFIG['auto_close_hours']} horas",
+    inline=False,
+)
+
+# Overwrites aplicados ao fechar: dono só lê, @everyone deixa de ver o canal
+_CLOSED_OWNER_OVERWRITE = discord.PermissionOverwrite(send_messages=False, add_reactions=False, view_channel=True)
+_CLOSED_EVERYONE_OVERWRITE = discord.PermissionOverwrite(send_messages=False, add_reactions=False, view_channel=False)
 
 
 async def close_ticket_channel(bot, channel: discord.TextChannel, auto_close: bool = False, skip_close_message: bool = False):
     """Fecha um canal de ticket garantindo que a mensagem de fechamento apareça."""
     try:
         ticket = await bot.db.get_ticket_by_channel(channel.id)
-        await bot.db.close_ticket(channel.id)
-        
-        embed = discord.Embed(
-            title="🔒 TICKET FECHADO",
-            description="Este ticket foi fechado e está agora em modo somente leitura.\n\n"
-                       "**Histórico Preservado:** Todo o histórico foi mantido.\n"
-                       "**Reabertura:** Use o botão abaixo para reabrir este ticket.",
-            color=EMBED_COLORS['closed'],
-            timestamp=datetime.now()
-        )
-        
-        if auto_close:
-            embed.add_field(
-                name="⏰ Motivo",
-                value=f"Fechamento automático após {BOT_CONFIG['auto_close_hours']} horas",
-                inline=False
-            )
+        # Já fechado no banco: nada a fazer (evita mensagem e PATCH repetidos em retries)
+        if ticket and ticket.get('status') == 'closed':
+            logger.debug("Ticket %s já estava fechado; ignorando", channel.id)
+            return
         
+        # Gravação do fechamento e mensagem no canal são independentes: vão em paralelo.
+        # Com skip_close_message quem chamou já postou a própria mensagem (com o botão de reabrir).
+        pending = [bot.db.close_ticket(channel.id)]
         if not skip_close_message:
-            reopen_view = ReopenTicketView()
-            await channel.send(embed=embed, view=reopen_view)
-        else:
-            reopen_view = ReopenTicketView()
-            await channel.send(view=reopen_view)
+            template = _AUTO_CLOSE_EMBED_TEMPLATE if auto_close else _CLOSE_EMBED_TEMPLATE
+            embed = template.copy()
+            embed.timestamp = datetime.now()
+            pending.append(channel.send(embed=embed, view=bot.reopen_ticket_view))
+
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Falha parcial ao fechar ticket no canal %s: %s", channel.id, result)
         
         async def update_permissions_async():
             try:
                 guild = channel.guild
+                # Dono e @everyone num único PATCH do canal
+                changes = {guild.default_role: _CLOSED_EVERYONE_OVERWRITE}
                 if ticket:
-                    ticket_owner = guild.get_member(ticket['user_id'])
-                    if ticket_owner:
-                        await channel.set_permissions(
-                            ticket_owner, 
-                            send_messages=False,
-                            add_reactions=False,
-                            view_channel=True
-                        )
-                        await asyncio.sleep(1)
-                
-                await channel.set_permissions(
-                    guild.default_role, 
-                    send_messages=False,
-                    add_reactions=False,
-                    view_channel=False
-                )
+                    # Sem o intent de membros o dono pode não estar em cache; o overwrite só precisa do ID
+                    ticket_owner = guild.get_member(ticket['user_id']) or discord.Object(id=ticket['user_id'], type=discord.Member)
+                    changes[ticket_owner] = _CLOSED_OWNER_OVERWRITE
+                await replace_overwrites_throttled(channel, changes)
             except Exception as e:
-                logger.warning(f"Erro ao atualizar permissões após fechamento: {e}")
+                logger.warning("Erro ao atualizar permissões após fechamento: %s", e)
         
-        asyncio.create_task(update_permissions_async())
-        logger.info(f"Ticket {channel.id} fechado com sucesso")
+        _spawn(update_permissions_async())
+        logger.info("Ticket %s fechado com sucesso", channel.id)
         
-    except Exception as e:
-        logger.error(f"Erro ao fechar canal {channel.id}: {e}")
+    except Exception:
+        logger.exception("Erro ao fechar canal %s", channel.id)
         try:
             await channel.send("❌ Erro ao fechar ticket. Contate um administrador.")
         except:
@@ -491,14 +738,160 @@ REQUIRED_TICKET_PERMISSIONS = {
     "embed_links": "Embed Links",
     "attach_files": "Attach Files",
 }
+_REQUIRED_TICKET_PERMISSIONS = discord.Permissions(**dict.fromkeys(REQUIRED_TICKET_PERMISSIONS, True))
+_PERMISSION_NAMES_BY_BIT = {
+    discord.Permissions(**{attr: True}).value: name for attr, name in REQUIRED_TICKET_PERMISSIONS.items()
+}
+
+
+def _missing_ticket_permissions(perms: discord.Permissions) -> List[str]:
+    """Nomes das permissões exigidas que faltam em ``perms`` (comparação por bitmask)."""
+    required = _REQUIRED_TICKET_PERMISSIONS.value
+    if perms.value & required == required:
+        return []  # caminho comum: todas presentes
+    missing_mask = required & ~perms.value
+    missing = []
+    while missing_mask:
+        bit = missing_mask & -missing_mask
+        missing.append(_PERMISSION_NAMES_BY_BIT[bit])
+        missing_mask ^= bit
+    return missing
+
+# Cargo de suporte e categoria de tickets por guild, com validade curta
+GUILD_RESOURCE_TTL = 300
+_GUILD_RESOURCE_CACHE: Dict[int, Dict[str, Any]] = {}
+
+
+def get_guild_resources(guild: discord.Guild) -> Dict[str, Any]:
+    """Retorna (do cache, se válido) o cargo de suporte e a categoria de tickets da guild."""
+    entry = _GUILD_RESOURCE_CACHE.get(guild.id)
+    if entry and entry["expires"] > time.monotonic():
+        return entry
+
+    support_role = _find_support_role(guild)
+    # Parte fixa dos overwrites de todo ticket da guild; só o dono é acrescentado por ticket
+    base_overwrites = {guild.default_role: _DENY_ALL_OVERWRITE}
+    if guild.me:
+        base_overwrites[guild.me] = _STAFF_OVERWRITE
+    # Equipe de suporte entra por cargo (um overwrite), não membro a membro
+    if support_role:
+        base_overwrites[support_role] = _STAFF_OVERWRITE
+    entry = {
+        "support_role": support_role,
+        "base_overwrites": base_overwrites,
+        "role_mention": support_role.mention if support_role else STAFF_MENTION,
+        "category": _find_tickets_category(guild),
+        "expires": time.monotonic() + GUILD_RESOURCE_TTL,
+    }
+    _GUILD_RESOURCE_CACHE[guild.id] = entry
+    return entry
+
+
+def _find_support_role(guild: discord.Guild) -> Optional[discord.Role]:
+    # get_role é uma consulta direta no cache do discord.py; o nome fica como fallback
+    role = guild.get_role(BOT_CONFIG["support_role_id"])
+    if role is None:
+        role = discord.utils.get(guild.roles, name=BOT_CONFIG["support_role_name"])
+        if role is not None:
+            logger.warning("Cargo de suporte encontrado só pelo nome na guild %s; confira support_role_id", guild.id)
+    return role
+
+
+def _find_tickets_category(guild: discord.Guild) -> Optional[discord.CategoryChannel]:
+    category_id = BOT_CONFIG["tickets_category_id"]
+    if category_id:
+        category = guild.get_channel(category_id)
+        if isinstance(category, discord.CategoryChannel):
+            return category
+        logger.warning("Categoria %s não encontrada na guild %s; buscando pelo nome", category_id, guild.id)
+    return discord.utils.get(guild.categories, name=BOT_CONFIG["tickets_category_name"])
+
+
+def invalidate_guild_resources(guild_id: int):
+    _GUILD_RESOURCE_CACHE.pop(guild_id, None)
+
+# Intervalo mínimo entre cliques em "Abrir Ticket" do mesmo usuário (anti-spam)
+OPEN_TICKET_COOLDOWN = 3
+_OPEN_TICKET_LAST_CLICK: Dict[int, float] = {}
+
+
+def _open_ticket_cooldown_left(user_id: int) -> float:
+    """Segundos que faltam para o usuário poder clicar de novo (0 = liberado)."""
+    now = time.monotonic()
+    last = _OPEN_TICKET_LAST_CLICK.get(user_id)
+    if last is not None and now - last < OPEN_TICKET_COOLDOWN:
+        return OPEN_TICKET_COOLDOWN - (now - last)
+    _OPEN_TICKET_LAST_CLICK[user_id] = now
+    if len(_OPEN_TICKET_LAST_CLICK) > 1024:
+        for uid in [uid for uid, ts in _OPEN_TICKET_LAST_CLICK.items() if now - ts >= OPEN_TICKET_COOLDOWN]:
+            del _OPEN_TICKET_LAST_CLICK[uid]
+    return 0
+
+
+def _ticket_recently_opened(ticket: Dict[str, Any]) -> bool:
+    """Ticket criado/reaberto dentro da janela de cooldown (submit duplicado do mesmo usuário)."""
+    created_at = ticket.get('created_at')
+    if not created_at:
+        return False
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - created_at).total_seconds() < OPEN_TICKET_COOLDOWN
+
+# Locks por (guild, usuário) em uso; somem sozinhos quando nenhum submit os referencia.
+# Dois submits simultâneos passariam juntos pela checagem do último ticket e
+# criariam canais duplicados (e overwrites editados logo após a criação se perdem).
+_USER_TICKET_LOCKS: "WeakValueDictionary[Tuple[int, int], asyncio.Lock]" = WeakValueDictionary()
+
+# Criação de canais tem rate limit próprio (por guild) e longo no Discord: rajadas de
+# tickets ficam na fila aqui em vez de tomar 429 e travar por minutos
+CHANNEL_CREATE_CONCURRENCY = 2
+_CHANNEL_CREATE_SEMAPHORES: Dict[int, asyncio.Semaphore] = {}
+
+
+def _channel_create_semaphore(guild_id: int) -> asyncio.Semaphore:
+    semaphore = _CHANNEL_CREATE_SEMAPHORES.get(guild_id)
+    if semaphore is None:
+        semaphore = _CHANNEL_CREATE_SEMAPHORES[guild_id] = asyncio.Semaphore(CHANNEL_CREATE_CONCURRENCY)
+    return semaphore
+
+
+# Criação da categoria de tickets é serializada por guild: com o semáforo acima dois
+# primeiros tickets simultâneos criariam categorias duplicadas
+_CATEGORY_CREATE_LOCKS: Dict[int, asyncio.Lock] = {}
+
+
+async def _ensure_tickets_category(guild: discord.Guild) -> discord.CategoryChannel:
+    lock = _CATEGORY_CREATE_LOCKS.setdefault(guild.id, asyncio.Lock())
+    async with lock:
+        # Relido sob o lock: quem esperou vê a categoria criada por quem chegou antes
+        resources = get_guild_resources(guild)
+        category = resources["category"]
+        if not category:
+            category = resources["category"] = await guild.create_category(name=BOT_CONFIG["tickets_category_name"])
+        return category
+
+# Mensagens de abertura do ticket; a menção da equipe vem do cache da guild
+STAFF_MENTION = f"<@&{BOT_CONFIG['support_role_id']}>"
+_TICKET_NOTIFICATION_NEW = "🔔 **{user}, seu ticket foi criado!**\n📞 {staff} responderá em breve."
+_TICKET_NOTIFICATION_REOPENED = "🔔 **{user}, seu ticket foi reaberto!**\n📞 {staff} responderá em breve."
+
+# Texto da confirmação ephemeral, indexado por is_reopened
+_EPHEMERAL_CONFIRMATION = {
+    False: "🎫 **Ticket Criado!** Acesse seu ticket em {}",
+    True: "🔄 **Ticket Reaberto!** Seu ticket foi reaberto em {}",
+}
+
+# Overwrites fixos dos canais de ticket (somente leitura, reaproveitados em todo ticket)
+_DENY_ALL_OVERWRITE = discord.PermissionOverwrite(read_messages=False)
+_USER_OVERWRITE = discord.PermissionOverwrite(read_messages=True, send_messages=True, attach_files=True, embed_links=True)
+_STAFF_OVERWRITE = discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_messages=True, embed_links=True)
 
 @dataclass
 class TicketChannelContext:
     channel: discord.TextChannel
     ticket_id: Optional[int]
     is_reopened: bool = False
-
-    skip_intro_embed: bool = False
+    is_duplicate: bool = False
 
 
 
@@ -518,34 +911,38 @@ class TicketView(discord.ui.View):
     )
     async def open_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
-            # Verificar se o usuário já tem um ticket aberto
-            user_tickets = await interaction.client.db.get_user_tickets(interaction.user.id, 5)
-            open_tickets = [t for t in user_tickets if t['status'] == 'open']
+            wait = _open_ticket_cooldown_left(interaction.user.id)
+            if wait:
+                await interaction.response.send_message(f"⏳ Aguarde {wait:.1f}s para tentar novamente.", ephemeral=True)
+                return
+
+            # Confirma o clique antes da consulta ao banco; a resposta vem editando o "pensando..."
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
+            # Verificar se o usuário já tem um ticket aberto (consulta em cache no DatabaseManager)
+            ticket = await interaction.client.db.get_user_open_ticket(interaction.user.id)
             
-            if open_tickets:
-                ticket = open_tickets[0]
+            if ticket:
                 channel = interaction.guild.get_channel(ticket['channel_id'])
                 if channel:
-                    await interaction.response.send_message(
-                        f"❌ Você já tem um ticket aberto: {channel.mention}\n"
+                    await interaction.edit_original_response(
+                        content=f"❌ Você já tem um ticket aberto: {channel.mention}\n"
                         f"**Motivo atual:** {ticket['reason']}\n"
                         f"**Criado em:** <t:{int(ticket['created_at'].timestamp())}:R>\n\n"
-                        f"💡 **Dica:** Você pode usar o mesmo canal para novos problemas!",
-                        ephemeral=True
+                        f"💡 **Dica:** Você pode usar o mesmo canal para novos problemas!"
                     )
                     schedule_ephemeral_deletion(interaction)
                     return
             
             view = ReasonSelectView(interaction.client, interaction.guild)
-            await interaction.response.send_message(
-                "🎫 **Selecione o motivo do seu chamado:**",
-                view=view,
-                ephemeral=True
+            await interaction.edit_original_response(
+                content="🎫 **Selecione o motivo do seu chamado:**",
+                view=view
             )
             schedule_ephemeral_deletion(interaction)
             
         except Exception as e:
-            logger.error(f"Erro ao abrir ticket: {e}")
+            logger.error("Erro ao abrir ticket: %s", e)
             if not interaction.response.is_done():
                 await interaction.response.send_message("❌ Erro interno. Tente novamente.", ephemeral=True)
             else:
@@ -586,42 +983,85 @@ class ReopenTicketView(discord.ui.View):
             schedule_ephemeral_deletion(interaction)
             
         except Exception as e:
-            logger.error(f"Erro ao reabrir ticket via botão: {e}")
+            logger.error("Erro ao reabrir ticket via botão: %s", e)
             if not interaction.response.is_done():
                 await interaction.response.send_message("❌ Erro interno ao reabrir ticket.", ephemeral=True)
 
+# (label, descrição, emoji) de cada motivo, extraídos uma vez de TICKET_REASONS
+_REASON_TRIPLES = tuple((r['label'], r['description'], r['emoji']) for r in TICKET_REASONS)
+
+# Opções do select de motivos já resolvidas, por guild (0 = sem guild/emojis crus)
+_REASON_OPTIONS_CACHE: Dict[int, List[discord.SelectOption]] = {}
+
+
+def invalidate_options_cache(guild_id: int):
+    """Descarta as opções de motivo da guild (chamado quando os emojis mudam)."""
+    _REASON_OPTIONS_CACHE.pop(guild_id, None)
+
+
 # Helper para ReasonSelect
 def _build_reason_options(bot: Optional[discord.Client], guild: Optional[discord.Guild]) -> List[discord.SelectOption]:
-    options: List[discord.SelectOption] = []
-    for reason in TICKET_REASONS:
-        emoji = resolve_emoji(bot, reason["emoji"], guild) if bot and guild else reason["emoji"]
-        options.append(
-            discord.SelectOption(
-                label=reason["label"],
-                description=reason["description"],
-                emoji=emoji,
-            )
+    resolve = bot and guild
+    return [
+        discord.SelectOption(
+            label=label,
+            description=description,
+            emoji=resolve_emoji(bot, emoji, guild) if resolve else emoji,
         )
-    return options
+        for label, description, emoji in _REASON_TRIPLES
+    ]
+
+# Parte fixa dos embeds de abertura; cada ticket copia e completa com os campos dinâmicos
+_NEW_TICKET_EMBED_TEMPLATE = discord.Embed(
+    title="🎫 Novo Ticket de Suporte",
+    description="Seu ticket foi criado com sucesso!",
+    color=0x00FF00,
+)
+_REOPEN_TICKET_EMBED_TEMPLATE = discord.Embed(
+    title="🔄 Ticket Reaberto",
+    description="Seu ticket foi reaberto!",
+    color=0xFFA500,
+)
+
+# Nomes dos campos dinâmicos do embed de abertura
+_FIELD_USER = "👤 Usuário"
+_FIELD_REASON = "🏷️ Motivo"
+_FIELD_DESCRIPTION = "📝 Descrição"
+
+
+def _build_ticket_embed(user, reason: str, description: str, is_reopened: bool, now: datetime) -> discord.Embed:
+    """Embed de abertura/reabertura postado no canal do ticket."""
+    template = _REOPEN_TICKET_EMBED_TEMPLATE if is_reopened else _NEW_TICKET_EMBED_TEMPLATE
+    embed = template.copy()
+    embed.timestamp = now
+    embed.add_field(name=_FIELD_USER, value=user.mention, inline=True)
+    embed.add_field(name=_FIELD_REASON, value=reason, inline=True)
+    embed.add_field(name=_FIELD_DESCRIPTION, value=description, inline=False)
+    return embed
 
 # Modais e Selects
 class ReasonSelect(discord.ui.Select):
     def __init__(self, bot=None, guild=None):
         self.bot = bot
         self.guild = guild
+        key = guild.id if bot and guild else 0
+        options = _REASON_OPTIONS_CACHE.get(key)
+        if options is None:
+            options = _REASON_OPTIONS_CACHE[key] = _build_reason_options(bot, guild)
         super().__init__(
             placeholder="Selecione o motivo do seu chamado...",
-            options=_build_reason_options(bot, guild),
+            options=options,
             custom_id="ticket_reason_select"
         )
     
     async def callback(self, interaction: discord.Interaction):
         try:
-            reason = self.values[0]
+            # Lido do payload: a instância registrada em setup_hook atende todos os usuários
+            reason = interaction.data["values"][0]
             modal = DescriptionModal(reason)
             await interaction.response.send_modal(modal)
         except Exception as e:
-            logger.error(f"Erro no callback do select: {e}")
+            logger.error("Erro no callback do select: %s", e)
             await interaction.response.send_message("❌ Ocorreu um erro. Tente novamente.", ephemeral=True)
 
 class DescriptionModal(discord.ui.Modal):
@@ -638,126 +1078,147 @@ class DescriptionModal(discord.ui.Modal):
         self.add_item(self.description)
     
     async def on_submit(self, interaction: discord.Interaction):
+        # Confirma a interação na hora; o trabalho pesado segue em background e responde via followup
+        await interaction.response.defer(ephemeral=True)
+        _spawn(self._process_submission(interaction))
+
+    async def _process_submission(self, interaction: discord.Interaction):
         try:
-            await interaction.response.defer(ephemeral=True)
             guild = interaction.guild
             user = interaction.user
             if not guild: return
+            now = datetime.now()
 
-            context = await self._prepare_channel(interaction, guild, user)
+            # Permissões já validadas nesta guild ficam marcadas no cache (expira com TTL/eventos de cargo)
+            resources = get_guild_resources(guild)
+            if not resources.get("perms_ok"):
+                missing_perms = _missing_ticket_permissions(guild.me.guild_permissions)
+                if missing_perms:
+                    await interaction.followup.send(
+                        f"❌ O bot não tem as permissões necessárias: {', '.join(missing_perms)}",
+                        ephemeral=True,
+                    )
+                    return
+                resources["perms_ok"] = True
+
+            # Serializa submits do mesmo usuário (duplo clique) para não criar canais duplicados
+            lock = _USER_TICKET_LOCKS.setdefault((guild.id, user.id), asyncio.Lock())
+            async with lock:
+                context = await self._prepare_channel(interaction, guild, user, now)
+            if context and context.is_duplicate:
+                await interaction.followup.send(
+                    f"ℹ️ Seu ticket já está aberto em {context.channel.mention}", ephemeral=True
+                )
+                return
             if not context or not context.ticket_id:
                 if context and not context.is_reopened:
                     await context.channel.delete(reason="Erro ao criar ticket no banco")
                 await self._notify_creation_failure(interaction)
                 return
 
-            if not context.skip_intro_embed:
-                control_view = TicketControlView()
-                embed = self._build_ticket_embed(user, self.description.value, context.is_reopened)
-                await context.channel.send(
-                    content=self._build_ticket_opening_content(user, context.is_reopened),
-                    embed=embed,
-                    view=control_view,
-                )
-
-            await self._send_ephemeral_confirmation(interaction, context.channel, context.is_reopened)
-            # Log omission for brevity
+            # Confirmação ephemeral e chamadas no canal não dependem uma da outra: envia em paralelo.
+            # (No ticket novo a mensagem inicial já saiu junto com a gravação no banco.)
+            channel = context.channel
+            pending = [self._send_ephemeral_confirmation(interaction, channel, context.is_reopened)]
+            if context.is_reopened:
+                pending.append(channel.send(
+                    content=self._build_ticket_opening_content(user, True, get_guild_resources(guild)["role_mention"]),
+                    embed=_build_ticket_embed(user, self.reason, self.description.value, True, now),
+                    view=interaction.client.ticket_control_view,
+                ))
+                pending.append(set_permissions_throttled(channel, user, send_messages=True, add_reactions=True, view_channel=True))
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.warning("Falha parcial ao concluir ticket no canal %s: %s", channel.id, result)
 
         except Exception as exc:
-            logger.error(f"Erro no modal submit: {exc}")
+            logger.error("Erro no modal submit: %s", exc)
             await interaction.followup.send("❌ Ocorreu um erro no processamento.", ephemeral=True)
 
-    async def _prepare_channel(self, interaction, guild, user) -> Optional[TicketChannelContext]:
+    async def _prepare_channel(self, interaction, guild, user, now: datetime) -> Optional[TicketChannelContext]:
+        channel = None
         latest_ticket = await interaction.client.db.get_user_latest_ticket(user.id)
         if latest_ticket:
             channel = guild.get_channel(latest_ticket["channel_id"])
-            if channel:
-                # Reopen Logic inline
-                ticket_id = await interaction.client.db.reopen_ticket(channel.id, self.reason, self.description.value)
-                if not ticket_id: return None
-                
-                embed = self._build_reopen_embed(user)
-                control_view = TicketControlView()
-                await channel.send(
-                    content=self._build_ticket_opening_content(user, True),
-                    embed=embed,
-                    view=control_view,
-                )
-                
-                # Restore permissions
-                await channel.set_permissions(user, send_messages=True, add_reactions=True, view_channel=True)
-                
-                return TicketChannelContext(channel=channel, ticket_id=ticket_id, is_reopened=True, skip_intro_embed=True)
 
-        return await self._create_channel_with_ticket(interaction, guild, user)
+        if channel and latest_ticket["status"] == "open" and _ticket_recently_opened(latest_ticket):
+            # Submit que esperou o lock de outro recém-concluído: aponta o canal em vez de reabrir
+            return TicketChannelContext(channel=channel, ticket_id=latest_ticket["id"], is_duplicate=True)
 
-    async def _create_channel_with_ticket(self, interaction, guild, user) -> Optional[TicketChannelContext]:
-        category = discord.utils.get(guild.categories, name=BOT_CONFIG["tickets_category_name"])
-        if not category:
-            category = await guild.create_category(name=BOT_CONFIG["tickets_category_name"])
+        if channel:
+            # Reopen Logic inline
+            ticket_id = await interaction.client.db.reopen_ticket(channel.id, self.reason, self.description.value)
+            if not ticket_id: return None
+            return TicketChannelContext(channel=channel, ticket_id=ticket_id, is_reopened=True)
 
-        overwrites = {
-            guild.default_role: discord.PermissionOverwrite(read_messages=False),
-            user: discord.PermissionOverwrite(read_messages=True, send_messages=True, attach_files=True, embed_links=True),
-        }
-        if guild.me:
-            overwrites[guild.me] = discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_messages=True, embed_links=True)
+        return await self._create_channel_with_ticket(interaction, guild, user, now)
+
+    async def _create_channel_with_ticket(self, interaction, guild, user, now: datetime) -> Optional[TicketChannelContext]:
+        resources = get_guild_resources(guild)
+        overwrites = dict(resources["base_overwrites"])
+        overwrites[user] = _USER_OVERWRITE
 
         channel_name = f"💻┃{user.name.lower()}"
-        channel = await category.create_text_channel(name=channel_name, overwrites=overwrites)
+        async with _channel_create_semaphore(guild.id):
+            category = resources["category"] or await _ensure_tickets_category(guild)
+            channel = await category.create_text_channel(name=channel_name, overwrites=overwrites)
         
-        ticket_id = await interaction.client.db.create_ticket(
-            user_id=user.id, user_name=str(user), channel_id=channel.id,
-            reason=self.reason, description=self.description.value,
+        # Gravação no banco e mensagem inicial em paralelo; se o banco falhar o canal é apagado
+        ticket_id, sent = await asyncio.gather(
+            interaction.client.db.create_ticket(
+                user_id=user.id, user_name=str(user), channel_id=channel.id,
+                reason=self.reason, description=self.description.value,
+            ),
+            channel.send(
+                content=self._build_ticket_opening_content(user, False, resources["role_mention"]),
+                embed=_build_ticket_embed(user, self.reason, self.description.value, False, now),
+                view=interaction.client.ticket_control_view,
+            ),
+            return_exceptions=True,
         )
+        if isinstance(sent, Exception):
+            logger.warning("Falha ao enviar mensagem inicial no canal %s: %s", channel.id, sent)
+        if isinstance(ticket_id, BaseException):
+            # Sem isso a exceção passaria por ticket_id válido e o canal órfão não seria apagado
+            logger.error("Erro ao gravar ticket do canal %s: %s", channel.id, ticket_id)
+            ticket_id = None
+        if ticket_id:
+            interaction.client.wake_auto_close()
         return TicketChannelContext(channel=channel, ticket_id=ticket_id)
 
-    def _build_ticket_embed(self, user, description, is_reopened):
-        embed = discord.Embed(
-            title="🔄 Ticket Reaberto" if is_reopened else "🎫 Novo Ticket de Suporte",
-            description="Seu ticket foi reaberto!" if is_reopened else "Seu ticket foi criado com sucesso!",
-            color=0xFFA500 if is_reopened else 0x00FF00,
-            timestamp=datetime.now()
-        )
-        embed.add_field(name="👤 Usuário", value=user.mention, inline=True)
-        embed.add_field(name="🏷️ Motivo", value=self.reason, inline=True)
-        embed.add_field(name="📝 Descrição", value=description, inline=False)
-        return embed
-
-    def _build_reopen_embed(self, user):
-        return self._build_ticket_embed(user, self.description.value, True)
-
-    def _build_ticket_opening_content(self, user, is_reopened):
-        action = "reaberto" if is_reopened else "criado"
-        return f"🔔 **{user.mention}, seu ticket foi {action}!**\n📞 <@&1382008028517109832> responderá em breve."
+    def _build_ticket_opening_content(self, user, is_reopened, role_mention):
+        template = _TICKET_NOTIFICATION_REOPENED if is_reopened else _TICKET_NOTIFICATION_NEW
+        return template.format(user=user.mention, staff=role_mention)
 
     async def _send_ephemeral_confirmation(self, interaction, channel, is_reopened):
-        embed = discord.Embed(
-            title="Ticket Criado/Reaberto",
-            description=f"Acesse seu ticket em {channel.mention}",
-            color=0x00FF00
-        )
-        message = await interaction.followup.send(embed=embed, ephemeral=True)
+        # Confirmação só para o usuário: texto simples basta, sem montar embed
+        content = _EPHEMERAL_CONFIRMATION[is_reopened].format(channel.mention)
+        message = await interaction.followup.send(content, ephemeral=True)
         schedule_ephemeral_deletion(interaction, message, delay=120)
 
     async def _notify_creation_failure(self, interaction):
         await interaction.followup.send("❌ Erro ao criar ticket.", ephemeral=True)
 
 class ReasonSelectView(discord.ui.View):
-    def __init__(self, bot=None, guild=None):
-        super().__init__(timeout=300)
+    def __init__(self, bot=None, guild=None, timeout: Optional[float] = 300):
+        # timeout=None só na instância persistente do setup_hook; as de cada clique expiram
+        super().__init__(timeout=timeout)
         self.add_item(ReasonSelect(bot, guild))
 
+# Status disponíveis ao fechar um ticket (constantes, compartilhadas entre selects)
+_CLOSE_STATUS_OPTIONS = [
+    discord.SelectOption(label="Resolvido", emoji="✅", value="resolvido"),
+    discord.SelectOption(label="Chamado Aberto", emoji="📞", value="chamado_aberto"),
+    discord.SelectOption(label="Aguardando Resposta", emoji="⏳", value="aguardando_resposta"),
+    discord.SelectOption(label="Em Análise", emoji="🔍", value="em_analise")
+]
+_CLOSE_STATUS_LABELS = MappingProxyType({option.value: option.label for option in _CLOSE_STATUS_OPTIONS})
+
 class CloseStatusSelect(discord.ui.Select):
     def __init__(self, ticket):
         self.ticket = ticket
-        options = [
-            discord.SelectOption(label="Resolvido", emoji="✅", value="resolvido"),
-            discord.SelectOption(label="Chamado Aberto", emoji="📞", value="chamado_aberto"),
-            discord.SelectOption(label="Aguardando Resposta", emoji="⏳", value="aguardando_resposta"),
-            discord.SelectOption(label="Em Análise", emoji="🔍", value="em_analise")
-        ]
-        super().__init__(placeholder="Selecione o status do ticket...", options=options, custom_id="pause_status_select")
+        super().__init__(placeholder="Selecione o status do ticket...", options=_CLOSE_STATUS_OPTIONS, custom_id="pause_status_select")
     
     async def callback(self, interaction: discord.Interaction):
         try:
@@ -765,7 +1226,7 @@ class CloseStatusSelect(discord.ui.Select):
             modal = PauseDescriptionModal(self.ticket, status)
             await interaction.response.send_modal(modal)
         except Exception as e:
-            logger.error(f"Erro no select close: {e}")
+            logger.error("Erro no select close: %s", e)
             await interaction.response.send_message("❌ Erro.", ephemeral=True)
 
 
@@ -775,7 +1236,7 @@ class PauseDescriptionModal(discord.ui.Modal):
     def __init__(self, ticket: dict, status: str):
         self.ticket = ticket
         self.status = status
-        title = f"Status: {status.replace('_', ' ').title()}"
+        title = f"Status: {_CLOSE_STATUS_LABELS.get(status, status)}"
         super().__init__(title=title)
         self.description = discord.ui.TextInput(
             label="Detalhes", placeholder="Descreva...", style=discord.TextStyle.paragraph, max_length=1000, required=True
@@ -795,14 +1256,13 @@ class PauseDescriptionModal(discord.ui.Modal):
                 timestamp=datetime.now()
             )
             embed.add_field(name="Responsável", value=user.mention)
-            await channel.send(embed=embed)
-            
-            await asyncio.sleep(2)
+            # O botão de reabrir vai junto do status: uma mensagem a menos no canal
+            await channel.send(embed=embed, view=interaction.client.reopen_ticket_view)
             await close_ticket_channel(interaction.client, channel, auto_close=False, skip_close_message=True)
             await interaction.followup.send("✅ Ticket atualizado e fechado.", ephemeral=True)
             
         except Exception as e:
-            logger.error(f"Erro no pause modal: {e}")
+            logger.exception("Erro ao fechar ticket")
             await interaction.followup.send(f"❌ Erro: {e}", ephemeral=True)
 
 class CloseStatusView(discord.ui.View):
@@ -814,32 +1274,34 @@ class CloseStatusView(discord.ui.View):
 # UTILS DE SETUP (localizados aqui para acessar as Views)
 # =================================================================================================G
 
+# Painel de abertura de tickets: conteúdo fixo, montado uma vez e nunca alterado
+_TICKET_PANEL_EMBED = discord.Embed(
+    title="🎫 **SISTEMA DE TICKETS DE SUPORTE**",
+    description="**PRECISA DE AJUDA DA EQUIPE DE TI?**\n\n**Clique no botão abaixo para abrir um ticket!**",
+    color=EMBED_COLORS['info']
+)
+_TICKET_PANEL_EMBED.add_field(
+    name="📝 **PLATAFORMAS DISPONÍVEIS:**",
+    value=(
+        "**<:arbo:1437860050201874442> ARBO**\n\n"
+        "**<:Lais:1437865327001342052> LAIS**\n\n"
+        "**<:SP:1437860450523025459> SENDPULSE**\n\n"
+        "**❓ OUTROS**"
+    ),
+    inline=False
+)
+_TICKET_PANEL_EMBED.add_field(
+    name="⏰ **HORÁRIO DE ATENDIMENTO**",
+    value="**Segunda a Sexta**\n\n**08:20 às 12:30**\n\n**13:30 às 18:20**",
+    inline=False
+)
+_TICKET_PANEL_EMBED.set_footer(text=f"Tickets são fechados automaticamente após {BOT_CONFIG['auto_close_hours']} horas sem atividade.")
+
+
 async def setup_tickets_in_channel(bot, channel: discord.TextChannel):
     """Configura o sistema de tickets em um canal específico."""
-    embed = discord.Embed(
-        title="🎫 **SISTEMA DE TICKETS DE SUPORTE**",
-        description="**PRECISA DE AJUDA DA EQUIPE DE TI?**\n\n**Clique no botão abaixo para abrir um ticket!**",
-        color=EMBED_COLORS['info']
-    )
-    embed.add_field(
-        name="📝 **PLATAFORMAS DISPONÍVEIS:**",
-        value=(
-            "**<:arbo:1437860050201874442> ARBO**\n\n"
-            "**<:Lais:1437865327001342052> LAIS**\n\n"
-            "**<:SP:1437860450523025459> SENDPULSE**\n\n"
-            "**❓ OUTROS**"
-        ),
-        inline=False
-    )
-    embed.add_field(
-        name="⏰ **HORÁRIO DE ATENDIMENTO**",
-        value="**Segunda a Sexta**\n\n**08:20 às 12:30**\n\n**13:30 às 18:20**",
-        inline=False
-    )
-    embed.set_footer(text=f"Tickets são fechados automaticamente após {BOT_CONFIG['auto_close_hours']} horas sem atividade.")
-    
     view = TicketView()
-    await channel.send(embed=embed, view=view)
+    await channel.send(embed=_TICKET_PANEL_EMBED, view=view)
 
 
 # ==================================================================================================
@@ -866,7 +1328,7 @@ class TicketCommands(commands.Cog):
             await interaction.followup.send(f"✅ Configurado em {channel.mention}", ephemeral=True)
 
         except Exception as exc:
-            logger.error(f"Erro setup_tickets: {exc}")
+            logger.error("Erro setup_tickets: %s", exc)
             await interaction.followup.send("❌ Erro ao configurar.", ephemeral=True)
 
     @discord.app_commands.command(name="close", description="Fechar ticket com status específico (apenas administradores)")
@@ -884,7 +1346,9 @@ class TicketCommands(commands.Cog):
                 return
 
             user = interaction.user
-            has_support_role = discord.utils.get(user.roles, name=BOT_CONFIG["support_role_name"]) is not None
+            # Checagem por ID (busca binária nos cargos do membro) em vez de comparar nomes
+            support_role = get_guild_resources(interaction.guild)["support_role"]
+            has_support_role = support_role is not None and user.get_role(support_role.id) is not None
             has_manage_channels = user.guild_permissions.manage_channels
 
             if not (has_support_role or has_manage_channels):
@@ -900,7 +1364,7 @@ class TicketCommands(commands.Cog):
             schedule_ephemeral_deletion(interaction)
 
         except Exception as exc:
-            logger.error(f"Erro close: {exc}")
+            logger.error("Erro close: %s", exc)
             await interaction.response.send_message("❌ Erro ao fechar.", ephemeral=True)
 
 
@@ -958,7 +1422,7 @@ class AlertModal(discord.ui.Modal):
             await interaction.followup.send("✅ Alerta enviado com sucesso!", ephemeral=True)
             
         except Exception as e:
-            logger.error(f"Erro ao enviar alerta: {e}")
+            logger.error("Erro ao enviar alerta: %s", e)
             await interaction.followup.send("❌ Erro ao enviar alerta.", ephemeral=True)
 
 
@@ -1011,7 +1475,7 @@ class EditAlertModal(discord.ui.Modal):
             await interaction.followup.send("✅ Alerta atualizado e reenviado!", ephemeral=True)
             
         except Exception as e:
-            logger.error(f"Erro ao editar alerta: {e}")
+            logger.error("Erro ao editar alerta: %s", e)
             await interaction.followup.send("❌ Erro ao editar alerta.", ephemeral=True)
 
 
@@ -1094,7 +1558,7 @@ class AlertCommands(commands.Cog):
             await interaction.response.send_modal(modal)
 
         except Exception as e:
-            logger.error(f"Erro no update_alert: {e}")
+            logger.error("Erro no update_alert: %s", e)
             await interaction.response.send_message("❌ Erro interno.", ephemeral=True)
 
 class BirthdayCommands(commands.Cog):
@@ -1238,6 +1702,12 @@ class BirthdayCommands(commands.Cog):
             
             for uid in user_ids:
                 member = guild.get_member(uid)
+                if member is None:
+                    # Membros não ficam em cache (sem intent de membros): busca só os aniversariantes
+                    try:
+                        member = await guild.fetch_member(uid)
+                    except discord.HTTPException:
+                        member = None
                 if member:
                     embed = discord.Embed(
                         title=f"🎉 Feliz Aniversário, {member.display_name}! 🎂",
@@ -1255,51 +1725,118 @@ class BirthdayCommands(commands.Cog):
 # BOT PRINCIPAL (app.py)
 # ==================================================================================================
 
+# Assinatura dos comandos do último sync bem-sucedido
+SYNC_CACHE_FILE = '.sync_cache'
+
+
+def _commands_signature(tree: discord.app_commands.CommandTree, application_id: Optional[int]) -> str:
+    # Ordenado por nome: a ordem de carga dos cogs não deve forçar um novo sync
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()), key=lambda c: c['name'])
+    raw = json.dumps([application_id, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _read_sync_signature() -> Optional[str]:
+    try:
+        with open(SYNC_CACHE_FILE, encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write_sync_signature(signature: str):
+    # Escrita atômica (fsync + replace): mesmo com queda logo após o sync, o próximo
+    # boot não lê arquivo pela metade nem re-sincroniza à toa
+    tmp_path = f"{SYNC_CACHE_FILE}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(signature)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, SYNC_CACHE_FILE)
+    except OSError as e:
+        logger.warning("Não foi possível salvar o cache de sync: %s", e)
+
+
+# Fechamentos automáticos simultâneos por rodada
+AUTO_CLOSE_CONCURRENCY = 5
+
+
 class OptimizedTicketBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
-        intents.message_content = True
-        intents.members = True
+        # Só slash commands: o conteúdo de mensagens alheias não é usado (as do próprio bot,
+        # lidas no update_alert, chegam completas mesmo sem o intent)
+        intents.message_content = False
+        # Sem cache de membros: nada itera membros e o chunking no startup custa RAM e tempo
+        intents.members = False
         intents.guilds = True  # Ensure guild intents are enabled
         
-        super().__init__(command_prefix=BOT_CONFIG['command_prefix'], intents=intents)
+        # Presença vai no IDENTIFY; reconexões não precisam reenviá-la no on_ready
+        activity = discord.Activity(type=discord.ActivityType.watching, name="tickets de suporte")
+        super().__init__(command_prefix=BOT_CONFIG['command_prefix'], intents=intents, activity=activity)
         
         self.prisma = Prisma() # Instancia cliente Prisma
         self.db = DatabaseManager(self.prisma) # Passa para o Manager
         self.startup_time = datetime.now()
         self._health_server_started = False
         self.health_server_port = None
+        self.ticket_control_view: Optional[TicketControlView] = None
+        self.reopen_ticket_view: Optional[ReopenTicketView] = None
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self._auto_close_wakeup = asyncio.Event()
         
     async def setup_hook(self):
         try:
-            # Conexão Prisma
-            await self.prisma.connect()
-            logger.info("Prisma conectado.")
-            
-            # Cogs
-            await self.add_cog(TicketCommands(self))
-            await self.add_cog(AlertCommands(self))
-            await self.add_cog(BirthdayCommands(self))
+            # Sessão HTTP única (pool de conexões) para chamadas externas do bot
+            self.http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            )
 
-            # Sync Comandos
-            logger.info("Sincronizando comandos...")
-            await self.tree.sync()
+            # Conexão com o banco e carga/sync dos comandos não dependem uma da outra
+            await asyncio.gather(self._connect_database(), self._load_commands())
             
             # Views
             logger.info("Adicionando views persistentes...")
             self.add_view(TicketView())
-            self.add_view(TicketControlView())
-            self.add_view(ReopenTicketView())
+            # Instâncias únicas reaproveitadas em todos os tickets
+            self.ticket_control_view = TicketControlView()
+            self.add_view(self.ticket_control_view)
+            self.reopen_ticket_view = ReopenTicketView()
+            self.add_view(self.reopen_ticket_view)
+            self.add_view(ReasonSelectView(timeout=None))
             
             # Tasks e Servidor
-            self.auto_close_tickets.start()
+            _spawn(self.auto_close_worker())
             self.ensure_health_server()
             logger.info("✅ Setup concluído!")
             
         except Exception as e:
-            logger.error(f"Erro setup: {e}")
+            logger.error("Erro setup: %s", e)
+
+    async def _connect_database(self):
+        await self.prisma.connect()
+        logger.info("Prisma conectado.")
+
+    async def _load_commands(self):
+        await asyncio.gather(
+            self.add_cog(TicketCommands(self)),
+            self.add_cog(AlertCommands(self)),
+            self.add_cog(BirthdayCommands(self)),
+        )
+
+        # Sync Comandos (só quando a definição mudou desde o último sync)
+        signature = _commands_signature(self.tree, self.application_id)
+        if signature == _read_sync_signature():
+            logger.info("Comandos inalterados, sync ignorado.")
+        else:
+            logger.info("Sincronizando comandos...")
+            await self.tree.sync()
+            _write_sync_signature(signature)
 
     async def close(self):
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
         if self.prisma.is_connected():
             await self.prisma.disconnect()
             logger.info("Prisma desconectado.")
@@ -1308,43 +1845,93 @@ class OptimizedTicketBot(commands.Bot):
     async def on_ready(self):
         try:
             startup_duration = (datetime.now() - self.startup_time).total_seconds()
-            await self.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name="tickets de suporte"))
-            print(f"🟢 Bot {self.user} online - {startup_duration:.1f}s")
+            logger.info("🟢 Bot %s online - %.1fs", self.user, startup_duration)
         except Exception as e:
-            logger.error(f"Erro on_ready: {e}")
+            logger.error("Erro on_ready: %s", e)
     
-    @tasks.loop(minutes=BOT_CONFIG['auto_close_check_minutes'])
-    async def auto_close_tickets(self):
+    async def on_guild_channel_update(self, before, after):
+        if isinstance(after, discord.CategoryChannel):
+            invalidate_guild_resources(after.guild.id)
+
+    async def on_guild_channel_delete(self, channel):
+        if isinstance(channel, discord.CategoryChannel):
+            invalidate_guild_resources(channel.guild.id)
+
+    async def on_guild_role_create(self, role):
+        invalidate_guild_resources(role.guild.id)
+
+    async def on_guild_role_update(self, before, after):
+        invalidate_guild_resources(after.guild.id)
+
+    async def on_guild_role_delete(self, role):
+        invalidate_guild_resources(role.guild.id)
+
+    async def on_guild_emojis_update(self, guild, before, after):
+        # Emojis mudaram: as opções do select precisam ser resolvidas de novo.
+        # O fallback em bot.emojis é global, então o cache de emojis é limpo inteiro.
+        invalidate_options_cache(guild.id)
+        _EMOJI_CACHE.clear()
+
+    def wake_auto_close(self):
+        """Acorda o agendador para recalcular o próximo vencimento (ex.: ticket novo)."""
+        self._auto_close_wakeup.set()
+
+    async def auto_close_worker(self):
+        """Dorme até o próximo ticket vencer em vez de varrer o banco em intervalo fixo."""
+        await self.wait_until_ready()
+        # Rede de segurança: nunca dorme mais que o intervalo de checagem configurado
+        max_sleep = BOT_CONFIG['auto_close_check_minutes'] * 60
+        while not self.is_closed():
+            timeout = max_sleep
+            try:
+                # Um único instante (UTC) para os dois cortes e para o cálculo da espera
+                now = datetime.now(timezone.utc)
+                await self.auto_close_tickets(now)
+
+                next_expiry = await self.db.get_next_expiry(BOT_CONFIG['auto_close_hours'], now)
+                if next_expiry is not None:
+                    remaining = (next_expiry - now).total_seconds()
+                    timeout = min(max_sleep, max(0.0, remaining) + 1)
+            except Exception as e:
+                # Sem isso uma falha encerraria a task e o fechamento automático pararia até reiniciar
+                logger.error("Erro no loop de fechamento automático: %s", e)
+                timeout = max_sleep
+
+            self._auto_close_wakeup.clear()
+            try:
+                await asyncio.wait_for(self._auto_close_wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def auto_close_tickets(self, now: Optional[datetime] = None):
         try:
-            open_tickets = await self.db.get_open_tickets()
-            if not open_tickets: return
-                
-            now = datetime.now()
-            auto_close_time = timedelta(hours=BOT_CONFIG['auto_close_hours'])
+            expired_tickets = await self.db.get_expired_tickets(BOT_CONFIG['auto_close_hours'], now)
             
-            for ticket in open_tickets:
-                created_at = ticket['created_at']
-                if isinstance(created_at, str):
-                    created_at = datetime.fromisoformat(created_at)
-                
-                if now - created_at >= auto_close_time:
-                    channel = self.get_channel(ticket['channel_id'])
-                    if channel:
-                        await close_ticket_channel(self, channel, auto_close=True)
+            channels = [self.get_channel(ticket['channel_id']) for ticket in expired_tickets]
+            channels = [channel for channel in channels if channel]
+            if not channels: return
+
+            # Fecha em paralelo, com limite para não estourar o rate limit do Discord
+            semaphore = asyncio.Semaphore(AUTO_CLOSE_CONCURRENCY)
+
+            async def close_one(channel):
+                async with semaphore:
+                    await close_ticket_channel(self, channel, auto_close=True)
+
+            results = await asyncio.gather(*(close_one(channel) for channel in channels), return_exceptions=True)
+            for channel, result in zip(channels, results):
+                if isinstance(result, Exception):
+                    logger.warning("Falha no fechamento automático do canal %s: %s", channel.id, result)
                         
         except Exception as e:
-            logger.error(f"Erro auto_close: {e}")
-    
-    @auto_close_tickets.before_loop
-    async def before_auto_close(self):
-        await self.wait_until_ready()
+            logger.error("Erro auto_close: %s", e)
     
     def ensure_health_server(self):
         should_enable = os.environ.get("ENABLE_HEALTH_SERVER", "true").lower() in {"1", "true", "yes", "on"}
         if not should_enable: return
         if self._health_server_started: return
         self.start_health_server()
-        self._log_panel_endpoint_response()
+        _spawn(self._log_panel_endpoint_response())
 
     def start_health_server(self):
         class HealthHandler(BaseHTTPRequestHandler):
@@ -1372,7 +1959,7 @@ class OptimizedTicketBot(commands.Bot):
                     server = HTTPServer(('0.0.0.0', candidate), HealthHandler)
                     self.health_server_port = candidate
                     started = True
-                    logger.info(f"🌐 Server HTTP porta {candidate}")
+                    logger.info("🌐 Server HTTP porta %s", candidate)
                     server.serve_forever()
                     break
                 except Exception: continue
@@ -1388,23 +1975,33 @@ class OptimizedTicketBot(commands.Bot):
             if os.environ.get(var): return int(os.environ.get(var)), "env"
         return 25565, "default"
     
-    def _log_panel_endpoint_response(self):
+    async def _log_panel_endpoint_response(self):
         endpoint = os.environ.get("BLAZE_PANEL_ENDPOINT", "http://sd-br2.blazebr.com:26244/")
         try:
-            with request.urlopen(endpoint, timeout=5) as resp:
-                logger.info(f"Painel respondeu {resp.status}")
+            async with self.http_session.get(endpoint, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                logger.info("Painel respondeu %s", resp.status)
         except Exception as e:
-            logger.warning(f"Erro painel: {e}")
+            logger.warning("Erro painel: %s", e)
 
     def _print_startup_banner(self):
-        print(f"\n🚀 Bot UpLink - Consolidated Startup\nTimestamp: {datetime.now()}")
+        logger.info("🚀 Bot UpLink - Consolidated Startup | Timestamp: %s", datetime.now())
 
 
 def main():
+    # Os handlers do basicConfig passam para o listener; o QueueHandler só repassa a mensagem
+    root_logger = logging.getLogger()
+    stream_handlers = list(root_logger.handlers)
+    log_listener = logging.handlers.QueueListener(_log_queue, *stream_handlers, respect_handler_level=True)
+    log_listener.start()
+    root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
     try:
         logger.info("Validando configuração...")
         validate_config()
         
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("uvloop ativo.")
+
         logger.info("Criando instância...")
         bot = OptimizedTicketBot()
         
@@ -1412,8 +2009,12 @@ def main():
         bot.run(DISCORD_TOKEN, log_handler=None)
         
     except Exception as e:
-        logger.error(f"Erro fatal: {e}")
+        logger.error("Erro fatal: %s", e)
         sys.exit(1)
+    finally:
+        # Esvazia a fila antes de sair e volta a escrever direto
+        root_logger.handlers = stream_handlers
+        log_listener.stop()
 
 
 if __name__ == "__main__":